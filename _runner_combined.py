@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+GunLog Combined Runner
+
+Runs several GunLog analytics modules inside one Python interpreter so that
+interpreter startup and shared imports are paid once per batch instead of
+once per script. Used by gunlog.py in --combined mode.
+
+Each module's output is captured and one JSON record per script is printed
+to stdout with the keys script, returncode, elapsed_ms, stdout and stderr.
+
+Usage:
+    python _runner_combined.py gunlog_error.py gunlog_ip2.py ...
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import importlib
+import contextlib
+import traceback
+
+# Number of trailing output lines kept from each script
+TAIL_LINES = 50
+
+def tail(text):
+    """Return the last TAIL_LINES lines of text."""
+    return "".join(text.splitlines(keepends=True)[-TAIL_LINES:])
+
+def run_module(script_name):
+    """
+    Import an analytics module and call its main().
+    
+    Args:
+        script_name: Name of the script file to run
+    
+    Returns:
+        dict: Record with script, returncode, elapsed_ms, stdout and stderr
+    """
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    start_ns = time.perf_counter_ns()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            module = importlib.import_module(os.path.splitext(script_name)[0])
+            module.main()
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return {
+        "script": script_name,
+        "returncode": returncode,
+        "elapsed_ms": (time.perf_counter_ns() - start_ns) / 1e6,
+        "stdout": tail(out.getvalue()),
+        "stderr": tail(err.getvalue())
+    }
+
+def main():
+    """Run every script named on the command line."""
+    for script_name in sys.argv[1:]:
+        record = run_module(script_name)
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,516 @@ GunLog Configuration
 
 This file contains configuration settings for the GunLog error analyzer.
 Edit this file to change paths and other settings.
+
+Besides the plain settings, shared helpers are exported so analytics scripts
+do not each rebuild them:
+    ERROR_REGEX       - ERROR_PATTERN compiled for str lines
+    ERROR_REGEX_BYTES - ERROR_PATTERN compiled for bytes lines, for logs
+                        read in binary mode without decoding every line
+    load_projects()   - the parsed PROJECTS_CSV rows, read once per process
+    date_str()/TODAY  - dates preformatted with DATE_FORMAT
+    worker_budget()   - processes a script may use, as shared out by the runner
+    map_projects()    - runs a function for every project in worker processes
+    load_state()/save_state() - small persistent state shared between runs
+    ensure_today_dirs() - creates today's report directory for each project
+    publish_report()  - places a report in a second directory as a hardlink
+    write_gzip_copy() - writes a .gz copy of a report when GZIP_REPORTS is set
+    split_log_ranges() - splits a log into line-aligned byte ranges
+    iter_file_blocks() - yields raw blocks of a file, read ahead in a thread
+    print_sample_lines() - prints the first lines of a log block
+    iter_text_lines() - yields decoded lines, read ahead in a background thread
+    scan_errors()     - finds the first ERROR_PATTERN match on each line of a
+                        bytes buffer, using Hyperscan when it is installed
+    compile_hs_db()   - compiles a pattern for Hyperscan, None without it
 """
 
+import os
+import re
+import csv
+import gzip
+import codecs
+import pickle
+import shutil
+import queue
+import threading
+import datetime
+import multiprocessing
+import concurrent.futures
+from functools import lru_cache
+from itertools import chain, repeat
+
 # File and directory paths
 PROJECTS_CSV = "list_projects.csv"
 OUTPUT_BASE_DIR = "/usr/local/www/example.com/www/gunlog/"
 
+@lru_cache(maxsize=4)
+def _read_projects(path, mtime):
+    """Parse a projects CSV file (cached per path and modification time)."""
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile, skipinitialspace=True)
+        # Clean any whitespace from all values in the row
+        return tuple({k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
+                     for row in reader)
+
+def load_projects(path=None):
+    """
+    Return the project rows from the projects CSV file.
+    
+    The file is parsed once per process and reparsed only when its
+    modification time changes, so scripts sharing an interpreter (or forked
+    from one that already loaded it) do not each parse it again.
+    
+    Args:
+        path: CSV file to read; defaults to PROJECTS_CSV
+    
+    Returns:
+        list: One dict per project with whitespace-stripped values
+    """
+    path = path or PROJECTS_CSV
+    return [dict(row) for row in _read_projects(path, os.path.getmtime(path))]
+
+# Persistent runner state: recent run summaries and index bookkeeping
+STATE_PATH = os.path.join(OUTPUT_BASE_DIR, ".runner_state.pkl")
+STATE_MAX_RUNS = 30
+
+def load_state():
+    """
+    Load the persistent runner state.
+    
+    Returns:
+        dict: The saved state, or a fresh {"runs": []} if there is none or
+        it cannot be read
+    """
+    try:
+        with open(STATE_PATH, "rb") as f:
+            state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {"runs": []}
+    return state if isinstance(state, dict) else {"runs": []}
+
+def save_state(state):
+    """
+    Atomically write the persistent runner state.
+    
+    Args:
+        state: Dict to store
+    """
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, STATE_PATH)
+
+# Environment variable holding the number of processes a script may use for
+# its own parallel work. The master runner sets it for each script so that
+# scripts running side by side share the CPUs instead of each starting
+# cpu_count() workers
+WORKERS_ENV = "GUNLOG_WORKERS"
+
+def worker_budget():
+    """
+    Return the number of processes this script may use for parallel work.
+    
+    Pool workers (e.g. the runner's fork pool) are daemonic and cannot start
+    processes of their own, so they get a budget of 1.
+    
+    Returns:
+        int: The WORKERS_ENV value if set to a positive number, otherwise
+        the CPU count
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    try:
+        workers = int(os.environ.get(WORKERS_ENV, ""))
+    except ValueError:
+        workers = 0
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def map_projects(fn, rows, *args, share_workers=False):
+    """
+    Call fn(row, *args) for every project row, in parallel where possible.
+    
+    Projects are independent and each only writes to its own directory, so
+    they are processed in worker processes, up to worker_budget() at a time.
+    With a budget of 1 they are processed in turn in this process.
+    
+    Args:
+        fn: Module-level function called as fn(row, *args)
+        rows: Project rows, as returned by load_projects()
+        *args: Further arguments passed to every call
+        share_workers: If True, fn is also passed the number of processes
+            each project may use for its own parallel work, the budget being
+            shared out between the projects running side by side
+    
+    Returns:
+        list: The results of fn, in the order of rows
+    """
+    cpus = worker_budget()
+    project_workers = max(1, min(len(rows), cpus))
+    if share_workers:
+        args += (max(1, cpus // project_workers),)
+    if project_workers == 1:
+        return [fn(row, *args) for row in rows]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=project_workers) as executor:
+        return list(executor.map(fn, rows, *map(repeat, args)))
+
 # Date format used for directory names and reports
 DATE_FORMAT = "%Y%m%d"
 
+@lru_cache(maxsize=8)
+def _format_date(d):
+    """Format a date with DATE_FORMAT (cached per date)."""
+    return d.strftime(DATE_FORMAT)
+
+def date_str(d=None):
+    """
+    Return a date formatted with DATE_FORMAT.
+    
+    Args:
+        d: Date to format; defaults to today
+    
+    Returns:
+        str: The formatted date, e.g. the per-day report directory name
+    """
+    return _format_date(d or datetime.date.today())
+
+# Today's date formatted with DATE_FORMAT, computed once at import
+TODAY = date_str()
+
+def ensure_today_dirs():
+    """
+    Create today's report directory for every configured project.
+    
+    Called once by the master runner before the analytics scripts start, so
+    each script finds OUTPUT_BASE_DIR/<project>/<date> already in place
+    instead of every script creating the same tree.
+    
+    Returns:
+        list: Paths of the per-project date directories
+    """
+    today = date_str()
+    date_dirs = []
+    for project_data in load_projects():
+        project_name = project_data.get('project', '').strip().replace('.', '_')
+        if not project_name:
+            continue
+        date_dir = os.path.join(OUTPUT_BASE_DIR, project_name, today)
+        os.makedirs(date_dir, exist_ok=True)
+        date_dirs.append(date_dir)
+    return date_dirs
+
+def publish_report(src, dst):
+    """
+    Make a finished report available at a second path.
+    
+    The per-project copies live on the same filesystem as the dated
+    reports, so a hardlink replaces reading and rewriting the whole file.
+    The link is created under a temporary name and renamed over dst, so an
+    existing copy is replaced atomically. Where hardlinks are unsupported
+    (another filesystem, or no link support) the contents are copied.
+    
+    Args:
+        src: Path of the generated report
+        dst: Path the report should also be available at
+    """
+    # A report rewritten in place is still linked from an earlier run
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    tmp = dst + ".tmp"
+    try:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+# Also write a gzip-compressed copy (<report>.gz) next to HTML reports, for
+# web servers that serve precompressed files (e.g. nginx gzip_static)
+GZIP_REPORTS = False
+
+def write_gzip_copy(path, compresslevel=6):
+    """
+    Write a gzip-compressed copy of a finished report if GZIP_REPORTS is set.
+    
+    Args:
+        path: Path of the report
+        compresslevel: gzip compression level
+    
+    Returns:
+        str: Path of the compressed copy, or None if GZIP_REPORTS is off
+    """
+    if not GZIP_REPORTS:
+        return None
+    gz_path = path + ".gz"
+    with open(path, "rb") as src, gzip.open(gz_path, "wb", compresslevel=compresslevel) as dst:
+        shutil.copyfileobj(src, dst)
+    return gz_path
+
 # Error log regex pattern
 ERROR_PATTERN = r'PHP (?:Warning|Notice|Error|Fatal error|Parse error):\s+(.*?) in (.*?) on line (\d+)'
+
+# Precompiled error log regex patterns
+ERROR_REGEX = re.compile(ERROR_PATTERN)
+ERROR_REGEX_BYTES = re.compile(ERROR_PATTERN.encode())
+
+# Hyperscan is optional. It compiles a pattern to a DFA and scans whole buffers
+# much faster than the backtracking re module, but reports match offsets only
+# (no capture groups).
+try:
+    import hyperscan  # type: ignore
+except ImportError:
+    hyperscan = None
+
+def compile_hs_db(pattern, flags=0):
+    """
+    Compile a regex pattern into a Hyperscan database.
+    
+    Matches are reported with their leftmost start offset
+    (HS_FLAG_SOM_LEFTMOST), which the block scans need to find the matching
+    line. Patterns without ^ or $ anchors need no HS_FLAG_MULTILINE.
+    
+    Args:
+        pattern: Pattern as str
+        flags: Further Hyperscan compile flags
+    
+    Returns:
+        hyperscan.Database: The compiled database, or None if Hyperscan is
+        not installed
+    """
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(expressions=[pattern.encode()], ids=[0], elements=1,
+               flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | flags])
+    return db
+
+# Hyperscan database for ERROR_PATTERN; scan_errors() uses it to locate
+# matching lines and then extracts the groups with ERROR_REGEX_BYTES
+ERROR_HS_DB = compile_hs_db(ERROR_PATTERN)
+
+def _hs_scan(buf, on_match):
+    """
+    Scan a bytes-like buffer for ERROR_PATTERN with Hyperscan.
+    
+    Args:
+        buf: Bytes-like object (bytes, bytearray or mmap) to scan
+        on_match: Callback called as on_match(id, start, end, flags, context);
+            returning True stops the scan
+    """
+    ERROR_HS_DB.scan(buf, match_event_handler=on_match)
+
+# None when Hyperscan is not installed
+hs_scan = _hs_scan if ERROR_HS_DB is not None else None
+
+def scan_errors(buf, end=None):
+    """
+    Find the first ERROR_PATTERN match on each line of a bytes-like buffer.
+    
+    Uses Hyperscan to locate matching lines when it is installed, otherwise
+    falls back to ERROR_REGEX_BYTES.finditer over the whole buffer.
+    
+    Args:
+        buf: Bytes-like object (bytes, bytearray or mmap) holding log data
+        end: Offset the scan stops at (defaults to the end of the buffer)
+    
+    Returns:
+        list: re.Match objects with the three ERROR_PATTERN groups, in
+        buffer order
+    """
+    if end is None:
+        end = len(buf)
+    find = buf.find
+    matches = []
+    
+    if hs_scan is None:
+        line_end = -1
+        for match in ERROR_REGEX_BYTES.finditer(buf, 0, end):
+            pos = match.start()
+            if pos < line_end:
+                continue
+            line_end = find(b"\n", pos, end)
+            if line_end < 0:
+                line_end = end
+            matches.append(match)
+        return matches
+    
+    line_starts = set()
+    rfind = buf.rfind
+    
+    def on_match(match_id, start, stop, flags, context):
+        # Hyperscan reports every end offset; keep one hit per line
+        line_starts.add(rfind(b"\n", 0, start) + 1)
+    
+    hs_scan(buf[:end] if end < len(buf) else buf, on_match)
+    
+    search = ERROR_REGEX_BYTES.search
+    for line_start in sorted(line_starts):
+        match = search(buf, line_start, end)
+        if match:
+            matches.append(match)
+    return matches
+
+def split_log_ranges(path, parts):
+    """
+    Split a log file into up to `parts` byte ranges that start on a line.
+    
+    Args:
+        path: Path to the log file
+        parts: Number of ranges wanted
+    
+    Returns:
+        list: (start, end) offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(size * i // parts)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+READ_CHUNK_SIZE = 1 << 20
+READ_PREFETCH_CHUNKS = 4
+
+def _read_chunks(f, chunks, stop, remaining, block_size=READ_CHUNK_SIZE):
+    """Read a file in block_size blocks into a queue (reader thread)."""
+    try:
+        while not stop.is_set():
+            size = block_size if remaining is None else min(block_size, remaining)
+            chunk = f.read(size) if size else b""
+            chunks.put(chunk)
+            if not chunk:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+    except Exception as e:
+        chunks.put(e)
+
+def iter_file_blocks(path, start=0, end=None, block_size=READ_CHUNK_SIZE):
+    """
+    Iterate over the raw blocks of a file, reading ahead in a thread.
+    
+    A background thread reads block_size blocks (up to READ_PREFETCH_CHUNKS
+    ahead) while the caller processes the previous block, so disk reads
+    overlap with parsing instead of stalling it. File reads release the
+    GIL, so the two really run concurrently.
+    
+    Args:
+        path: Path to the file
+        start: Byte offset to start reading at
+        end: Byte offset to stop reading at, or None for the end of file
+        block_size: Bytes read per block
+    
+    Yields:
+        bytes: Consecutive non-empty blocks of the file
+    """
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start)
+        remaining = None if end is None else max(end - start, 0)
+        chunks = queue.Queue(maxsize=READ_PREFETCH_CHUNKS)
+        stop = threading.Event()
+        reader = threading.Thread(target=_read_chunks, args=(f, chunks, stop, remaining, block_size),
+                                  daemon=True)
+        reader.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            # Stop the reader and unblock it if iteration ended early
+            stop.set()
+            while reader.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+def sample_lines(block, count):
+    """
+    Decode the first lines of a log block, to show the log's format.
+    
+    Args:
+        block: First block of the log file (bytes)
+        count: Number of lines wanted
+    
+    Returns:
+        list: Up to count decoded lines, each ending in "\\n" if it had a
+        line break
+    """
+    # Only the bytes up to the count-th newline are split and decoded
+    pos = -1
+    for _ in range(count):
+        pos = block.find(b"\n", pos + 1)
+        if pos < 0:
+            break
+    head = block[:pos + 1] if pos >= 0 else block
+    
+    lines = []
+    for line in head.splitlines(True)[:count]:
+        line = line.decode("utf-8", errors="replace")
+        if line.endswith("\r\n"):
+            line = line[:-2] + "\n"
+        elif line.endswith("\r"):
+            line = line[:-1] + "\n"
+        lines.append(line)
+    return lines
+
+def print_sample_lines(block, count=5):
+    """
+    Print the first lines of a log to show its format.
+    
+    Args:
+        block: First block of the log file (bytes)
+        count: Number of lines to print
+    """
+    for i, line in enumerate(sample_lines(block, count)):
+        print(f"Sample line {i+1}: {line[:100]}...")
+
+def iter_text_lines(path, encoding="utf-8", errors="replace", start=0, end=None):
+    """
+    Iterate over the decoded lines of a log file, reading ahead in a thread.
+    
+    The file is read with iter_file_blocks(), so disk reads overlap with
+    the caller's parsing of the lines. As in text mode, "\n", "\r\n" and a
+    lone "\r" all end a line.
+    
+    Args:
+        path: Path to the log file
+        encoding: Text encoding of the file
+        errors: How undecodable bytes are handled
+        start: Byte offset to start reading at (should begin a line)
+        end: Byte offset to stop reading at, or None for the end of file
+    
+    Yields:
+        str: Each line without its trailing newline
+    """
+    blocks = iter_file_blocks(path, start, end)
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ""
+    try:
+        for chunk in chain(blocks, (b"",)):
+            final = not chunk
+            text = pending + decoder.decode(chunk, final)
+            if "\r" in text:
+                # A "\r" ending the block stays pending, as the next block
+                # may start with its "\n"
+                cr = "\r" if not final and text.endswith("\r") else ""
+                text = text[:len(text) - len(cr)].replace("\r\n", "\n").replace("\r", "\n") + cr
+            lines = text.split("\n")
+            pending = lines.pop()
+            yield from lines
+        if pending:
+            yield pending
+    finally:
+        blocks.close()
@@ -2,11 +2,16 @@
 """
 GunLog Master Analytics Runner
 
-This script runs all GunLog analytics modules in sequence and generates a
+This script runs all GunLog analytics modules concurrently and generates a
 complete set of analytics reports for your web projects.
 
 Usage:
-    python gunlog_master.py
+    python gunlog_master.py [--combined | --async]
+
+    --combined  Run the analytics modules in two shared Python interpreters
+                instead of one per script
+    --async     Run one child process per script from a single asyncio event
+                loop instead of a thread per child
 
 Requirements:
     - All GunLog analytics scripts in the same directory
@@ -16,107 +21,685 @@ Requirements:
 import os
 import sys
 import time
+import json
 import subprocess
 import datetime
+import asyncio
+import concurrent.futures
+import contextlib
+import importlib.util
+import io
+import atexit
+import multiprocessing
+import traceback
+import threading
+import collections
+
+try:
+    from config import OUTPUT_BASE_DIR, load_projects, ensure_today_dirs, load_state, save_state, STATE_MAX_RUNS, WORKERS_ENV, worker_budget
+except ImportError:
+    OUTPUT_BASE_DIR = None
+    load_projects = None
+    ensure_today_dirs = None
+    load_state = save_state = None
+    WORKERS_ENV = "GUNLOG_WORKERS"
+    worker_budget = None
+
+# Directory holding the runner and the analytics scripts
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Repeated output strings and the interpreter used for child scripts
+_BANNER = "=" * 80
+_DIVIDER = "-" * 50
+_PY = sys.executable
+
+# Seconds a script may run before it is killed, unless its entry sets timeout_s
+DEFAULT_TIMEOUT_S = 300
 
-def run_script(script_name, description):
+# Number of trailing output lines kept from each script
+TAIL_LINES = 50
+
+# Analytics modules loaded in this process, keyed by script file name
+_MOD_CACHE = {}
+
+def load_module(script_name):
     """
-    Run a Python script and log the result.
+    Import an analytics script once and cache the module.
     
     Args:
-        script_name: Name of the script file to run
+        script_name: Name of the script file to import
+    
+    Returns:
+        module: The imported module, or None if it cannot be imported or
+        does not expose a main() function
+    """
+    if script_name not in _MOD_CACHE:
+        module = None
+        try:
+            spec = importlib.util.spec_from_file_location(os.path.splitext(script_name)[0],
+                                                          os.path.join(SCRIPT_DIR, script_name))
+            module = importlib.util.module_from_spec(spec)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                spec.loader.exec_module(module)
+            if not callable(getattr(module, "main", None)):
+                module = None
+        except (Exception, SystemExit):
+            module = None
+        _MOD_CACHE[script_name] = module
+    return _MOD_CACHE[script_name]
+
+def share_workers(concurrent):
+    """
+    Split the run's CPUs between scripts running at the same time.
+    
+    Each child script is told its share through WORKERS_ENV, so scripts that
+    parallelise internally start at most that many processes and the run
+    as a whole stays within the CPU count.
+    
+    Args:
+        concurrent: Number of scripts running side by side
+    
+    Returns:
+        int: Processes each of those scripts may use (at least 1)
+    """
+    cpus = worker_budget() if worker_budget is not None else (os.cpu_count() or 1)
+    return max(1, cpus // max(1, concurrent))
+
+def script_env(workers):
+    """Return the environment for a child script allowed `workers` processes."""
+    if workers is None:
+        return None
+    return dict(os.environ, **{WORKERS_ENV: str(workers)})
+
+def _tail(text):
+    """Return the last TAIL_LINES lines of text."""
+    return "".join(text.splitlines(keepends=True)[-TAIL_LINES:])
+
+def _run_module_main(script_name):
+    """
+    Call an analytics module's main() inside a pool worker.
+    
+    Args:
+        script_name: Name of the script file whose module should run
+    
+    Returns:
+        tuple: (return code, captured stdout, captured stderr)
+    """
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            load_module(script_name).main()
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, _tail(out.getvalue()), _tail(err.getvalue())
+
+def run_subprocess(argv, timeout=None, workers=None):
+    """
+    Run a command, keeping only the last TAIL_LINES lines of its output.
+    
+    Output is drained by background threads into bounded ring buffers, so
+    memory stays constant however much the child prints.
+    
+    The Popen call is kept eligible for CPython's posix_spawn fast path,
+    which avoids a full fork of the runner: do not add preexec_fn, pass_fds,
+    cwd, start_new_session or close_fds=True. close_fds=False is safe here
+    because descriptors opened by Python are non-inheritable by default.
+    
+    Args:
+        argv: Command line to execute
+        timeout: Seconds to wait before killing the command, or None
+        workers: Processes the command may use (see share_workers), or None
+            to leave the environment unchanged
+    
+    Returns:
+        tuple: (return code, stdout tail, stderr tail)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the command was killed after timeout;
+            output and stderr hold the tails read before it was killed
+    """
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1 << 20,
+                            close_fds=False, env=script_env(workers))
+    tail_out = collections.deque(maxlen=TAIL_LINES)
+    tail_err = collections.deque(maxlen=TAIL_LINES)
+    readers = [threading.Thread(target=tail_out.extend, args=(proc.stdout,)),
+               threading.Thread(target=tail_err.extend, args=(proc.stderr,))]
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        returncode = proc.wait()
+        timed_out = True
+    for reader in readers:
+        reader.join()
+    proc.stdout.close()
+    proc.stderr.close()
+    if timed_out:
+        raise subprocess.TimeoutExpired(argv, timeout, output="".join(tail_out), stderr="".join(tail_err))
+    return returncode, "".join(tail_out), "".join(tail_err)
+
+def build_result(script_name, description, returncode, stdout, stderr, elapsed_ms, error=None):
+    """
+    Build the result dict and log block for a finished script.
+    
+    Args:
+        script_name: Name of the script file that ran
         description: Description of what the script does
+        returncode: Exit status of the script
+        stdout: Captured (tail of) standard output
+        stderr: Captured (tail of) standard error
+        elapsed_ms: Run time in milliseconds
+        error: Optional message when the script could not be run at all
     
     Returns:
-        bool: True if the script ran successfully, False otherwise
+        dict: Result with keys script, success, stdout, stderr, elapsed_ms and log
+    """
+    log = []
+    log.append("\n" + _BANNER)
+    log.append(f"Running: {script_name} - {description}")
+    log.append(_BANNER)
+    
+    success = error is None and returncode == 0
+    if error is not None:
+        log.append(f"ERROR: {error}")
+    elif success:
+        log.append(f"SUCCESS: {script_name} completed successfully")
+        log.append(f"Output: {stdout}")
+        log.append(f"Time taken: {elapsed_ms / 1000:.2f} seconds")
+    else:
+        log.append(f"ERROR: {script_name} failed with return code {returncode}")
+        log.append(f"Error output: {stderr}")
+    
+    return {"script": script_name, "success": success, "stdout": stdout, "stderr": stderr,
+            "elapsed_ms": elapsed_ms, "log": "\n".join(log)}
+
+def run_script(script_name, description, present, pool=None, timeout=None, workers=None, parallel=False):
     """
-    print("\n" + "="*80)
-    print(f"Running: {script_name} - {description}")
-    print("="*80)
+    Run a Python script and collect its log output.
     
-    start_time = time.time()
+    Output is buffered locally rather than printed so that several scripts
+    can run concurrently without interleaving their logs.
+    
+    Args:
+        script_name: Name of the script file to run
+        description: Description of what the script does
+        present: Set of file names found in SCRIPT_DIR
+        pool: Optional multiprocessing pool; scripts exposing main() are run
+            there instead of in a freshly started interpreter
+        timeout: Seconds the script may run before it is abandoned, or None
+        workers: Processes the script may use for its own parallel work
+        parallel: True for scripts that start worker processes themselves;
+            pool workers are daemonic and cannot, so these always run in a
+            child interpreter
+    
+    Returns:
+        dict: Result with keys script, success, stdout, stderr, elapsed_ms and log;
+        stdout and stderr hold at most the last TAIL_LINES lines
+    """
+    start_ns = time.perf_counter_ns()
+    returncode, stdout, stderr, error = 1, "", "", None
     
     try:
         # Check if the script exists
-        if not os.path.exists(script_name):
-            print(f"ERROR: Script {script_name} not found!")
-            return False
-        
-        # Run the script
-        result = subprocess.run([sys.executable, script_name], capture_output=True, text=True)
-        
-        # Check the result
-        if result.returncode == 0:
-            print(f"SUCCESS: {script_name} completed successfully")
-            print(f"Output: {result.stdout[:500]}..." if len(result.stdout) > 500 else f"Output: {result.stdout}")
-            elapsed_time = time.time() - start_time
-            print(f"Time taken: {elapsed_time:.2f} seconds")
-            return True
+        if script_name not in present:
+            error = f"Script {script_name} not found!"
+        # Run the script, reusing a pool worker when the module is importable
+        elif pool is not None and not parallel and load_module(script_name) is not None:
+            # A timed-out pool task cannot be killed on its own; its worker is
+            # terminated when the pool shuts down at the end of the run
+            returncode, stdout, stderr = pool.apply_async(_run_module_main, (script_name,)).get(timeout)
         else:
-            print(f"ERROR: {script_name} failed with return code {result.returncode}")
-            print(f"Error output: {result.stderr}")
-            return False
+            returncode, stdout, stderr = run_subprocess([_PY, os.path.join(SCRIPT_DIR, script_name)], timeout,
+                                                        workers)
     
+    except (subprocess.TimeoutExpired, multiprocessing.TimeoutError):
+        error = f"{script_name} exceeded {timeout}s and was killed"
     except Exception as e:
-        print(f"ERROR: Failed to run {script_name} - {str(e)}")
-        return False
-
-def main():
-    """Main function to run all analytics scripts."""
-    print("GunLog Master Analytics Runner")
-    print("-"*50)
-    print(f"Started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Running from directory: {os.getcwd()}")
-    print("-"*50)
-    
-    # Define all scripts to run and their descriptions
-    scripts = [
-        {"name": "gunlog_error.py", "description": "Error Analytics - Analyzing PHP errors and warnings"},
-        {"name": "gunlog_ip2.py", "description": "IP Analytics - Analyzing visitor IP addresses and locations"},
-        {"name": "gunlog_popular.py", "description": "Page Analytics - Analyzing most viewed pages"},
-        {"name": "gunlog_performance.py", "description": "Performance Analytics - Analyzing website performance metrics"},
-        {"name": "gunlog_content.py", "description": "Content Analytics - Analyzing content engagement metrics"},
-        {"name": "gunlog_security.py", "description": "Security Analytics - Analyzing security events and threats"},
-        {"name": "gunlog_seo.py", "description": "SEO Analytics - Analyzing search engine optimization metrics"},
-        {"name": "gunlog_traffic.py", "description": "Traffic Analytics - Analyzing visitor traffic patterns"},
-        {"name": "gunlog_daily_summary.py", "description": "Daily Summary - Generating daily error and access summaries"},
-        {"name": "gunlog_index_generator.py", "description": "Index Generator - Creating unified dashboard index pages"}
-    ]
+        error = f"Failed to run {script_name} - {str(e)}"
+    
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+    return build_result(script_name, description, returncode, stdout, stderr, elapsed_ms, error)
+
+def run_combined_batch(batch, descriptions, present, timeouts, workers=None):
+    """
+    Run several scripts inside a single Python interpreter.
+    
+    The batch is handed to _runner_combined.py, which imports each module and
+    calls its main(), printing one JSON record per script.
+    
+    Args:
+        batch: List of script file names to run together
+        descriptions: Mapping of script file name to description
+        present: Set of file names found in SCRIPT_DIR
+        timeouts: Mapping of script file name to its timeout in seconds; the
+            batch is killed once the sum for its scripts has elapsed
+        workers: Processes each script may use for its own parallel work
+    
+    Returns:
+        list: Result dicts, one per script in the batch
+    """
+    missing = [name for name in batch if name not in present]
+    batch = [name for name in batch if name in present]
+    results = [build_result(name, descriptions[name], 1, "", "", 0.0, f"Script {name} not found!")
+               for name in missing]
+    if not batch:
+        return results
+    
+    argv = [_PY, os.path.join(SCRIPT_DIR, "_runner_combined.py")] + batch
+    timeout = sum(timeouts[name] for name in batch)
+    timed_out = False
+    try:
+        returncode, stdout, stderr = run_subprocess(argv, timeout, workers)
+    except subprocess.TimeoutExpired as e:
+        # Scripts that finished before the kill have already reported
+        returncode, stdout, stderr = 1, e.output, e.stderr
+        timed_out = True
+    except Exception as e:
+        returncode, stdout, stderr = 1, "", f"Failed to run combined batch - {str(e)}"
+    
+    records = {}
+    for line in stdout.splitlines():
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record["script"]] = record
+    
+    for name in batch:
+        record = records.get(name)
+        if record is None and timed_out:
+            results.append(build_result(name, descriptions[name], 1, "", "", 0.0,
+                                        f"{name} did not finish before the batch exceeded {timeout}s and was killed"))
+        elif record is None:
+            # The combined interpreter died before reporting this script
+            results.append(build_result(name, descriptions[name], returncode or 1, "", stderr, 0.0))
+        else:
+            results.append(build_result(name, descriptions[name], record["returncode"],
+                                        record["stdout"], record["stderr"], record["elapsed_ms"]))
+    return results
+
+def write_block(lines):
+    """
+    Write a block of lines to stdout with a single write and flush.
+    
+    Args:
+        lines: List of lines to write, without trailing newlines
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def write_summary_record(summary_file, result):
+    """
+    Append one script result to the JSONL run log.
+    
+    Args:
+        summary_file: Open text file for the run log, or None to skip
+        result: Result dict from run_script
+    """
+    if summary_file is None:
+        return
+    summary_file.write(json.dumps({
+        "script": result["script"],
+        "ok": result["success"],
+        "elapsed_ms": round(result["elapsed_ms"], 3),
+        "ts": time.time()
+    }) + "\n")
+
+def record_result(result, results, summary_file):
+    """
+    Print a finished script's log block and add it to the run results.
+    
+    Args:
+        result: Result dict from build_result
+        results: List collecting the results of this run
+        summary_file: Optional open file receiving one JSON line per script
+    """
+    write_block([result["log"]])
+    result["timestamp"] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    results.append(result)
+    write_summary_record(summary_file, result)
+
+def run_scripts(scripts, max_workers, present, pool=None, summary_file=None, combined_workers=None):
+    """
+    Run scripts concurrently, respecting their declared dependencies.
+    
+    Every script whose dependencies have finished is dispatched at once, so
+    independent scripts run in parallel and a script only waits on its real
+    predecessors. A failed dependency does not prevent dependents from
+    running, matching the behaviour of the old sequential runner.
+    
+    Args:
+        scripts: List of script dicts with name, description, depends_on and
+            optionally timeout_s
+        max_workers: Maximum number of scripts running at the same time
+        present: Set of file names found in SCRIPT_DIR
+        pool: Optional multiprocessing pool passed through to run_script
+        summary_file: Optional open file receiving one JSON line per script
+        combined_workers: If set, each wave of ready scripts is split into this
+            many batches, each run in a single interpreter by run_combined_batch
+    
+    Returns:
+        list: Result dicts from run_script, in completion order
+    """
+    pending = {script["name"]: set(script["depends_on"]) for script in scripts}
+    descriptions = {script["name"]: script["description"] for script in scripts}
+    timeouts = {script["name"]: script.get("timeout_s", DEFAULT_TIMEOUT_S) for script in scripts}
+    parallel = {script["name"]: script.get("parallel", False) for script in scripts}
+    
+    # Dependencies on scripts that are not part of this run are ignored
+    for deps in pending.values():
+        deps.intersection_update(pending)
     
-    # Run each script
     results = []
-    for script in scripts:
-        success = run_script(script["name"], script["description"])
-        results.append({
-            "script": script["name"],
-            "success": success,
-            "timestamp": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
+    done = set()
+    running = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            ready = [name for name, deps in pending.items() if deps <= done]
+            for name in ready:
+                del pending[name]
+            if combined_workers:
+                batches = min(combined_workers, len(ready))
+                workers = share_workers(min(max_workers, len(running) + batches))
+                for i in range(batches):
+                    batch = ready[i::combined_workers]
+                    running[executor.submit(run_combined_batch, batch, descriptions, present, timeouts,
+                                            workers)] = batch
+            else:
+                workers = share_workers(min(max_workers, len(running) + len(ready)))
+                for name in ready:
+                    running[executor.submit(run_script, name, descriptions[name], present, pool,
+                                            timeouts[name], workers, parallel[name])] = [name]
+            
+            if not running:
+                # Nothing can make progress: the remaining scripts form a cycle
+                for name in pending:
+                    record_result(build_result(name, descriptions[name], 1, "", "", 0.0,
+                                               f"{name} has circular dependencies"),
+                                  results, summary_file)
+                break
+            
+            finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                done.update(running.pop(future))
+                outcome = future.result()
+                for result in (outcome if isinstance(outcome, list) else [outcome]):
+                    record_result(result, results, summary_file)
     
-    # Print summary
-    print("\n" + "="*80)
-    print("ANALYTICS RUN SUMMARY")
-    print("="*80)
+    return results
+
+async def _read_tail(stream):
+    """
+    Drain an asyncio stream, keeping only its last TAIL_LINES lines.
+    
+    Args:
+        stream: asyncio.StreamReader connected to a child's output
+    
+    Returns:
+        str: The decoded tail of the stream
+    """
+    tail = collections.deque(maxlen=TAIL_LINES)
+    partial = b""
+    while True:
+        chunk = await stream.read(1 << 16)
+        if not chunk:
+            break
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        tail.extend(lines)
+    if partial:
+        tail.append(partial)
+    return "".join(line.decode("utf-8", "replace") + "\n" for line in tail)
+
+async def run_script_async(script_name, description, present, semaphore, timeout=None, workers=None):
+    """
+    Run a Python script as an asyncio subprocess.
+    
+    Args:
+        script_name: Name of the script file to run
+        description: Description of what the script does
+        present: Set of file names found in SCRIPT_DIR
+        semaphore: asyncio.Semaphore bounding the number of live children
+        timeout: Seconds the child may run before it is killed, or None
+        workers: Processes the child may use for its own parallel work
+    
+    Returns:
+        dict: Result dict from build_result
+    """
+    if script_name not in present:
+        return build_result(script_name, description, 1, "", "", 0.0, f"Script {script_name} not found!")
     
+    async with semaphore:
+        start_ns = time.perf_counter_ns()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                _PY, os.path.join(SCRIPT_DIR, script_name),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=script_env(workers))
+        except Exception as e:
+            return build_result(script_name, description, 1, "", "", 0.0,
+                                f"Failed to run {script_name} - {str(e)}")
+        try:
+            stdout, stderr, returncode = await asyncio.wait_for(asyncio.gather(
+                _read_tail(proc.stdout), _read_tail(proc.stderr), proc.wait()), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return build_result(script_name, description, 1, "", "", (time.perf_counter_ns() - start_ns) / 1e6,
+                                f"{script_name} exceeded {timeout}s and was killed")
+        except asyncio.CancelledError:
+            # Ctrl-C or shutdown: do not leave the child running
+            proc.kill()
+            raise
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+    return build_result(script_name, description, returncode, stdout, stderr, elapsed_ms)
+
+async def run_scripts_async(scripts, max_workers, present, summary_file=None):
+    """
+    Run scripts from one asyncio event loop, respecting their dependencies.
+    
+    Each script is a coroutine that waits for its predecessors' completion
+    events and then for a semaphore slot, so independent scripts overlap
+    without a thread per child.
+    
+    Args:
+        scripts: List of script dicts with name, description, depends_on and
+            optionally timeout_s
+        max_workers: Maximum number of children running at the same time
+        present: Set of file names found in SCRIPT_DIR
+        summary_file: Optional open file receiving one JSON line per script
+    
+    Returns:
+        list: Result dicts in completion order
+    """
+    pending = {script["name"]: set(script["depends_on"]) for script in scripts}
+    descriptions = {script["name"]: script["description"] for script in scripts}
+    timeouts = {script["name"]: script.get("timeout_s", DEFAULT_TIMEOUT_S) for script in scripts}
+    for deps in pending.values():
+        deps.intersection_update(pending)
+    
+    # Scripts that can never become ready are part of (or wait on) a cycle.
+    # Each wave of scripts that become ready together shares out the CPUs
+    runnable = set()
+    workers = {}
+    while True:
+        ready = {name for name, deps in pending.items() if name not in runnable and deps <= runnable}
+        if not ready:
+            break
+        runnable |= ready
+        for name in ready:
+            workers[name] = share_workers(min(max_workers, len(ready)))
+    
+    results = []
+    for name in pending:
+        if name not in runnable:
+            record_result(build_result(name, descriptions[name], 1, "", "", 0.0,
+                                       f"{name} has circular dependencies"),
+                          results, summary_file)
+    
+    semaphore = asyncio.Semaphore(max_workers)
+    finished = {name: asyncio.Event() for name in runnable}
+    
+    async def run_when_ready(name):
+        await asyncio.gather(*(finished[dep].wait() for dep in pending[name]))
+        result = await run_script_async(name, descriptions[name], present, semaphore, timeouts[name],
+                                        workers[name])
+        record_result(result, results, summary_file)
+        finished[name].set()
+    
+    await asyncio.gather(*(run_when_ready(name) for name in pending if name in runnable))
+    return results
+
+def main(mode="pool"):
+    """
+    Main function to run all analytics scripts.
+    
+    Args:
+        mode: "pool" to run importable modules in a forked worker pool,
+            "combined" to run them in two shared interpreters per wave, or
+            "async" to run one child per script from an asyncio event loop
+    
+    Returns:
+        bool: True if every script succeeded
+    """
+    # Output is written in whole blocks, so let stdout buffer freely instead
+    # of issuing a write for every line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    atexit.register(sys.stdout.flush)
+    
+    write_block([
+        "GunLog Master Analytics Runner",
+        _DIVIDER,
+        f"Started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Running from directory: {os.getcwd()}",
+        _DIVIDER
+    ])
+    
+    # Analytics scripts only read the raw logs and are independent of each
+    # other; the aggregators read the reports the analytics scripts produce.
+    # Timeouts bound a hung script (e.g. a stalled GeoIP lookup) while leaving
+    # room for large logs. Scripts marked parallel start worker processes of
+    # their own, so they are never run inside the (daemonic) fork pool
+    analytics = [
+        {"name": "gunlog_error.py", "description": "Error Analytics - Analyzing PHP errors and warnings", "depends_on": [], "timeout_s": 600, "parallel": True},
+        {"name": "gunlog_ip2.py", "description": "IP Analytics - Analyzing visitor IP addresses and locations", "depends_on": [], "timeout_s": 600},
+        {"name": "gunlog_popular.py", "description": "Page Analytics - Analyzing most viewed pages", "depends_on": [], "timeout_s": 600},
+        {"name": "gunlog_performance.py", "description": "Performance Analytics - Analyzing website performance metrics", "depends_on": [], "timeout_s": 600},
+        {"name": "gunlog_content.py", "description": "Content Analytics - Analyzing content engagement metrics", "depends_on": [], "timeout_s": 600, "parallel": True},
+        {"name": "gunlog_security.py", "description": "Security Analytics - Analyzing security events and threats", "depends_on": [], "timeout_s": 600},
+        {"name": "gunlog_seo.py", "description": "SEO Analytics - Analyzing search engine optimization metrics", "depends_on": [], "timeout_s": 600},
+        {"name": "gunlog_traffic.py", "description": "Traffic Analytics - Analyzing visitor traffic patterns", "depends_on": [], "timeout_s": 600}
+    ]
+    analytics_names = [script["name"] for script in analytics]
+    
+    # Define all scripts to run, their descriptions and dependencies
+    scripts = analytics + [
+        {"name": "gunlog_daily_summary.py", "description": "Daily Summary - Generating daily error and access summaries",
+         "depends_on": analytics_names, "timeout_s": 600, "parallel": True},
+        {"name": "gunlog_index_generator.py", "description": "Index Generator - Creating unified dashboard index pages",
+         "depends_on": analytics_names + ["gunlog_daily_summary.py"], "timeout_s": DEFAULT_TIMEOUT_S}
+    ]
+    
+    max_workers = min(len(scripts), os.cpu_count() or 1)
+    
+    # List the script directory once instead of probing each script
+    present = {entry.name for entry in os.scandir(SCRIPT_DIR) if entry.is_file()}
+    
+    # Create every project's report directory for today in one pass
+    if ensure_today_dirs is not None:
+        try:
+            ensure_today_dirs()
+        except OSError as e:
+            write_block([f"WARNING: Cannot create report directories - {str(e)}"])
+    
+    # Machine-readable run log, one JSON line per script
+    summary_file = None
+    if OUTPUT_BASE_DIR:
+        try:
+            summary_file = open(os.path.join(OUTPUT_BASE_DIR, "runner.jsonl"), "a", buffering=1, encoding="utf-8")
+        except OSError as e:
+            write_block([f"WARNING: Cannot open run log - {str(e)}"])
+    
+    try:
+        if mode == "combined":
+            results = run_scripts(scripts, max_workers, present, summary_file=summary_file,
+                                  combined_workers=2)
+        elif mode == "async":
+            results = asyncio.run(run_scripts_async(scripts, max_workers, present, summary_file))
+        elif "fork" in multiprocessing.get_all_start_methods():
+            # Import the analytics modules once, before forking, so every pool worker
+            # inherits them instead of paying interpreter startup and imports per script
+            pooled = [script["name"] for script in scripts
+                      if script["name"] in present and not script.get("parallel", False)]
+            for name in pooled:
+                load_module(name)
+            if load_projects is not None:
+                try:
+                    load_projects()
+                except OSError:
+                    pass
+            with multiprocessing.get_context("fork").Pool(processes=max(1, min(max_workers, len(pooled)))) as pool:
+                results = run_scripts(scripts, max_workers, present, pool, summary_file)
+        else:
+            results = run_scripts(scripts, max_workers, present, summary_file=summary_file)
+    finally:
+        if summary_file is not None:
+            summary_file.close()
+    
+    # Keep a short history of runs for the index generator and later runs
+    if save_state is not None:
+        try:
+            state = load_state()
+            run = {"ts": time.time(),
+                   "results": [{key: result[key] for key in ("script", "success", "elapsed_ms", "timestamp")}
+                               for result in results]}
+            state["runs"] = (state.get("runs", []) + [run])[-STATE_MAX_RUNS:]
+            save_state(state)
+        except OSError as e:
+            write_block([f"WARNING: Cannot save runner state - {str(e)}"])
+    
+    # Print summary
     successful = sum(1 for r in results if r["success"])
     failed = len(results) - successful
     
-    print(f"Total scripts: {len(results)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    print("\nDetailed results:")
-    print("-"*50)
+    summary = [
+        "\n" + _BANNER,
+        "ANALYTICS RUN SUMMARY",
+        _BANNER,
+        f"Total scripts: {len(results)}",
+        f"Successful: {successful}",
+        f"Failed: {failed}",
+        "\nDetailed results:",
+        _DIVIDER
+    ]
     
     for result in results:
         status = "SUCCESS" if result["success"] else "FAILED"
-        print(f"{result['script']}: {status} at {result['timestamp']}")
+        summary.append(f"{result['script']}: {status} at {result['timestamp']} ({result['elapsed_ms'] / 1000:.2f}s)")
     
-    print("-"*50)
-    print(f"Analytics run completed at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    summary.append(_DIVIDER)
+    summary.append(f"Analytics run completed at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    write_block(summary)
     
     # Return success status for the entire run
     return failed == 0
 
 if __name__ == "__main__":
-    success = main()
+    if "--combined" in sys.argv[1:]:
+        success = main("combined")
+    elif "--async" in sys.argv[1:]:
+        success = main("async")
+    else:
+        success = main()
     sys.exit(0 if success else 1)
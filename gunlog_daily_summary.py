@@ -16,15 +16,17 @@ Requirements:
 
 import os
 import re
-import csv
+import json
 import datetime
 import calendar
 import shutil
+from itertools import repeat
+import concurrent.futures
 from collections import defaultdict, Counter
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import OUTPUT_BASE_DIR, date_str, load_projects, iter_file_blocks, sample_lines, split_log_ranges, write_gzip_copy, worker_budget, map_projects, compile_hs_db
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
@@ -33,60 +35,228 @@ except ImportError:
 DATE_PATTERN = r'\[(\d{2})/([A-Za-z]{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2}) ([+-]\d{4})\]'
 ERROR_PATTERN = r'PHP (?:Warning|Notice|Error|Fatal error|Parse error):'
 
+# Compiled once at import for bytes, so blocks of the log can be scanned
+# without decoding them line by line
+DATE_REGEX_BYTES = re.compile(DATE_PATTERN.encode())
+ERROR_REGEX_BYTES = re.compile(ERROR_PATTERN.encode())
+# Fallback date formats: YYYY-MM-DD and DD/MM/YYYY
+ISO_DATE_REGEX_BYTES = re.compile(rb'(\d{4})-(\d{2})-(\d{2})')
+DMY_DATE_REGEX_BYTES = re.compile(rb'(\d{2})/(\d{2})/(\d{4})')
+
+# Month abbreviations of DATE_PATTERN mapped to their two-digit numbers;
+# unknown abbreviations are counted as January. One dict lookup on the
+# matched bytes is cheaper in CPython than indexing a table by the first
+# two byte values, which needs several integer operations per line
+MONTH_NUMBERS = {
+    b'Jan': b'01', b'Feb': b'02', b'Mar': b'03', b'Apr': b'04', b'May': b'05', b'Jun': b'06',
+    b'Jul': b'07', b'Aug': b'08', b'Sep': b'09', b'Oct': b'10', b'Nov': b'11', b'Dec': b'12'
+}
+
+# Hyperscan database for ERROR_PATTERN (None without Hyperscan); the error
+# scan only needs match offsets, since dates are extracted per matched line
+# with re
+ERROR_HS_DB = compile_hs_db(ERROR_PATTERN)
+
+# Error logs are read and scanned in blocks of this many bytes
+READ_BLOCK_SIZE = 4 * 1024 * 1024
+# A progress line is printed each time this many more lines are processed
+PROGRESS_LINES = 100000
+# Logs at least this large are scanned in parallel, one byte range per CPU
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
 def ensure_dir(directory):
     """Create directory if it doesn't exist."""
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def extract_date_from_log_line(line):
+def extract_date_from_log_line(line, start=0, end=None):
     """
     Extract date from log line using the standard Apache/PHP log format.
     
     Args:
-        line: Log line to extract date from
+        line: Bytes-like log data to extract the date from
+        start: Offset of the line in the buffer
+        end: Offset just past the line (defaults to the end of the buffer)
         
     Returns:
-        str: Date in format "YYYY-MM-DD" or None if extraction fails
+        bytes: Date in format b"YYYY-MM-DD" or None if extraction fails
     """
+    if end is None:
+        end = len(line)
+    
     # Look for the standard log date format [DD/MMM/YYYY:HH:MM:SS +ZZZZ]
-    match = re.search(DATE_PATTERN, line)
+    match = DATE_REGEX_BYTES.search(line, start, end)
     if match:
-        day = match.group(1)
-        month_str = match.group(2)
-        year = match.group(3)
-        
-        # Convert month name to number
-        month_names = {
-            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-        }
-        month = month_names.get(month_str, 1)
-        
-        return f"{year}-{month:02d}-{day}"
+        day, month_str, year = match.group(1, 2, 3)
+        return b'-'.join((year, MONTH_NUMBERS.get(month_str, b'01'), day))
     
     # If the standard pattern fails, try a more generic approach to find dates
     # Look for date patterns in the format YYYY-MM-DD
-    date_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', line)
+    date_match = ISO_DATE_REGEX_BYTES.search(line, start, end)
     if date_match:
         return date_match.group(0)
     
     # Look for date patterns in the format DD/MM/YYYY
-    date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', line)
+    date_match = DMY_DATE_REGEX_BYTES.search(line, start, end)
     if date_match:
-        day = date_match.group(1)
-        month = date_match.group(2)
-        year = date_match.group(3)
-        return f"{year}-{month}-{day}"
+        day, month, year = date_match.group(1, 2, 3)
+        return b'-'.join((year, month, day))
     
     # Unable to extract date
     return None
 
-def count_errors_by_day(error_log_file):
+def find_error_positions(buf, end):
+    """
+    Return the start offsets of the ERROR_PATTERN matches in a buffer.
+    
+    Uses Hyperscan when it is installed, otherwise ERROR_REGEX_BYTES.finditer.
+    
+    Args:
+        buf: Bytes-like object holding log data
+        end: Offset the scan stops at
+    
+    Returns:
+        list: Match start offsets in increasing order
+    """
+    if ERROR_HS_DB is None:
+        return [match.start() for match in ERROR_REGEX_BYTES.finditer(buf, 0, end)]
+    
+    positions = []
+    
+    def on_match(match_id, start, stop, flags, context):
+        positions.append(start)
+    
+    ERROR_HS_DB.scan(buf[:end] if end < len(buf) else buf, match_event_handler=on_match)
+    return positions
+
+def count_error_dates(buf, daily_error_counts, end=None):
+    """
+    Count the error lines of a log buffer by date.
+    
+    A line is counted once however many errors it contains, and its date is
+    looked for anywhere in the line, as the line-by-line scan did.
+    
+    Args:
+        buf: Bytes-like object holding whole log lines
+        daily_error_counts: Counter updated with one count per dated error
+            line, keyed by the undecoded b"YYYY-MM-DD" date
+        end: Offset the scan stops at (defaults to the end of the buffer)
+    
+    Returns:
+        tuple: (error lines, error lines with an extractable date)
+    """
+    if end is None:
+        end = len(buf)
+    error_lines = 0
+    line_end = -1
+    # Dates are collected and tallied with one Counter.update, which counts
+    # in C, instead of a Counter increment per line
+    dates = []
+    add_date = dates.append
+    rfind = buf.rfind
+    find = buf.find
+    extract_date = extract_date_from_log_line
+    for pos in find_error_positions(buf, end):
+        if pos < line_end:
+            continue
+        line_start = rfind(b'\n', 0, pos) + 1
+        line_end = find(b'\n', pos, end)
+        if line_end < 0:
+            line_end = end
+        error_lines += 1
+        
+        date = extract_date(buf, line_start, line_end)
+        if date:
+            add_date(date)
+    daily_error_counts.update(dates)
+    return error_lines, len(dates)
+
+def print_sample_lines(block, count=5):
+    """
+    Print the first lines of a log to show its format.
+    
+    Args:
+        block: First block of the log file (bytes)
+        count: Number of lines to print
+    """
+    sample = sample_lines(block, count)
+    
+    output = [f"Sample of first {len(sample)} lines:"]
+    for i, line in enumerate(sample):
+        output.append(f"  Line {i+1}: {line[:100]}..." if len(line) > 100 else f"  Line {i+1}: {line}")
+    print("\n".join(output))
+
+def scan_log_range(error_log_file, start=0, end=None, raw_counts=None, show_progress=False,
+                   show_sample=False):
+    """
+    Count the error lines of one byte range of an error log by date.
+    
+    The range is read in blocks cut at the last newline; the partial line
+    after it is carried over to the next block. The blocks are read ahead in
+    a background thread while the previous one is scanned.
+    
+    Args:
+        error_log_file: Path to the error log file
+        start: Byte offset the range starts at (must begin a line)
+        end: Byte offset the range ends at, or None for the end of file
+        raw_counts: Counter to add the b"YYYY-MM-DD" counts to (a new one
+            if None), so a caller keeps the partial counts if reading fails
+        show_progress: Print a progress line every PROGRESS_LINES lines
+        show_sample: Print the first lines of the range (see print_sample_lines)
+    
+    Returns:
+        tuple: (raw_counts, total lines, error lines, dated error lines)
+    """
+    if raw_counts is None:
+        raw_counts = Counter()
+    total_lines = 0
+    error_lines = 0
+    dated_errors = 0
+    next_progress = PROGRESS_LINES
+    tail = b''
+    for block in iter_file_blocks(error_log_file, start, end, READ_BLOCK_SIZE):
+        if show_sample:
+            print_sample_lines(block)
+            show_sample = False
+        buf = tail + block if tail else block
+        cut = buf.rfind(b'\n') + 1
+        tail = buf[cut:]
+        if not cut:
+            continue
+        
+        errors, dated = count_error_dates(buf, raw_counts, cut)
+        error_lines += errors
+        dated_errors += dated
+        total_lines += buf.count(b'\n', 0, cut)
+        
+        # Print progress for large files
+        if show_progress and total_lines >= next_progress:
+            print(f"  Processed {total_lines:,} lines, found {error_lines:,} errors...")
+            next_progress = (total_lines // PROGRESS_LINES + 1) * PROGRESS_LINES
+    
+    # Last line without a trailing newline
+    if tail:
+        errors, dated = count_error_dates(tail, raw_counts)
+        error_lines += errors
+        dated_errors += dated
+        total_lines += 1
+    
+    # Empty range
+    if show_sample:
+        print_sample_lines(b'')
+    
+    return raw_counts, total_lines, error_lines, dated_errors
+
+def count_errors_by_day(error_log_file, workers=None):
     """
     Count PHP errors by day in an error log file.
     
+    Logs of at least PARALLEL_MIN_BYTES are split into line-aligned byte
+    ranges that are scanned in separate processes and merged.
+    
     Args:
         error_log_file: Path to the error log file
+        workers: Number of scanner processes (defaults to worker_budget())
         
     Returns:
         Counter: Counter object with dates as keys and error counts as values
@@ -112,42 +282,34 @@ def count_errors_by_day(error_log_file):
         file_size = os.path.getsize(error_log_file)
         print(f"File size: {file_size:,} bytes")
         
-        # Sample the file to detect format (first 5 lines)
-        with open(error_log_file, 'r', encoding='utf-8', errors='replace') as f:
-            sample_lines = []
-            for i in range(5):
-                try:
-                    line = next(f)
-                    sample_lines.append(line)
-                except StopIteration:
-                    break
-        
-        print(f"Sample of first {len(sample_lines)} lines:")
-        for i, line in enumerate(sample_lines):
-            print(f"  Line {i+1}: {line[:100]}..." if len(line) > 100 else f"  Line {i+1}: {line}")
+        if workers is None:
+            workers = worker_budget()
+        if workers > 1 and file_size >= PARALLEL_MIN_BYTES:
+            ranges = split_log_ranges(error_log_file, workers)
+        else:
+            ranges = [(0, None)]
         
-        # Process the file
-        with open(error_log_file, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                total_lines += 1
-                
-                # Skip empty lines
-                if not line.strip():
-                    continue
-                
-                # Check if this is an error line
-                if re.search(ERROR_PATTERN, line):
-                    error_lines += 1
-                    
-                    # Extract date
-                    date = extract_date_from_log_line(line)
-                    if date:
-                        daily_error_counts[date] += 1
-                        dated_errors += 1
-                
-                # Print progress for large files
-                if total_lines % 100000 == 0:
-                    print(f"  Processed {total_lines:,} lines, found {error_lines:,} errors...")
+        raw_counts = Counter()
+        try:
+            if len(ranges) == 1:
+                _, total_lines, error_lines, dated_errors = scan_log_range(
+                    error_log_file, raw_counts=raw_counts, show_progress=True, show_sample=True)
+            else:
+                # The first range prints the sample of the file's first lines
+                starts, ends = zip(*ranges)
+                show_sample = [True] + [False] * (len(ranges) - 1)
+                with concurrent.futures.ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                    for range_counts, lines, errors, dated in executor.map(
+                            scan_log_range, repeat(error_log_file), starts, ends,
+                            repeat(None), repeat(False), show_sample):
+                        raw_counts.update(range_counts)
+                        total_lines += lines
+                        error_lines += errors
+                        dated_errors += dated
+        finally:
+            # Dates are counted undecoded; each distinct one is decoded once
+            for date, count in raw_counts.items():
+                daily_error_counts[date.decode()] += count
         
         print(f"Completed processing {total_lines:,} lines")
         print(f"Found {error_lines:,} error lines, of which {dated_errors:,} had extractable dates")
@@ -189,7 +351,7 @@ def generate_daily_error_report(project_name, daily_error_counts, output_dir):
     Returns:
         str: Path to the generated report
     """
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"{project_name}_daily_error_counts.html")
     
     # Get all dates
@@ -199,6 +361,9 @@ def generate_daily_error_report(project_name, daily_error_counts, output_dir):
         print(f"No error dates found for {project_name}")
         all_dates = [today]  # Add current date as fallback
     
+    # Counts looked up once and shared by the table, chart and text report
+    error_counts = [daily_error_counts.get(date, 0) for date in all_dates]
+    
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write(f"""<!DOCTYPE html>
 <html>
@@ -230,14 +395,16 @@ def generate_daily_error_report(project_name, daily_error_counts, output_dir):
         </tr>
 """)
         
-        # Add rows for each date
-        for date in all_dates:
-            error_count = daily_error_counts.get(date, 0)
-            f.write(f"""
+        # Add rows for each date, joined into one write
+        f.write(''.join(f"""
         <tr>
             <td>{date}</td>
             <td>{error_count:,}</td>
-        </tr>""")
+        </tr>""" for date, error_count in zip(all_dates, error_counts)))
+        
+        # Chart arrays are written as JSON, which is valid JavaScript
+        chart_labels = json.dumps(all_dates)
+        chart_data = json.dumps(error_counts)
         
         # Add chart and close HTML
         f.write(f"""
@@ -248,10 +415,10 @@ def generate_daily_error_report(project_name, daily_error_counts, output_dir):
         const errorChart = new Chart(errorCtx, {{
             type: 'line',
             data: {{
-                labels: [{', '.join([f"'{date}'" for date in all_dates])}],
+                labels: {chart_labels},
                 datasets: [{{
                     label: 'Daily Error Counts',
-                    data: [{', '.join([str(daily_error_counts.get(date, 0)) for date in all_dates])}],
+                    data: {chart_data},
                     backgroundColor: 'rgba(255, 99, 132, 0.2)',
                     borderColor: 'rgba(255, 99, 132, 1)',
                     borderWidth: 1,
@@ -297,9 +464,9 @@ def generate_daily_error_report(project_name, daily_error_counts, output_dir):
         f.write("Date         | Errors\n")
         f.write("-" * 25 + "\n")
         
-        for date in all_dates:
-            error_count = daily_error_counts.get(date, 0)
-            f.write(f"{date} | {error_count:,}\n")
+        f.write(''.join(f"{date} | {error_count:,}\n" for date, error_count in zip(all_dates, error_counts)))
+    
+    write_gzip_copy(report_file)
     
     print(f"Generated HTML error report: {report_file}")
     print(f"Generated text error report: {text_report_file}")
@@ -370,33 +537,27 @@ def generate_monthly_error_summary(project_name, daily_error_counts, output_dir)
         </tr>
 """)
         
-        # Add rows for each month
+        # Format each month once for display (YYYY-MM to Month YYYY); the
+        # table and the chart labels share the result
+        error_counts = []
+        display_months = []
         for month in all_months:
-            error_count = monthly_error_counts.get(month, 0)
-            
-            # Format month for display (YYYY-MM to Month YYYY)
+            error_counts.append(monthly_error_counts.get(month, 0))
             try:
                 year, month_num = month.split('-')
-                month_name = calendar.month_name[int(month_num)]
+                display_months.append(f"{calendar.month_name[int(month_num)]} {year}")
             except:
-                month_name = "Unknown"
-                year = "Unknown"
-            
-            f.write(f"""
+                display_months.append(None)
+        
+        # Add rows for each month, joined into one write
+        f.write(''.join(f"""
         <tr>
-            <td>{month_name} {year}</td>
+            <td>{display or "Unknown Unknown"}</td>
             <td>{error_count:,}</td>
-        </tr>""")
+        </tr>""" for display, error_count in zip(display_months, error_counts)))
         
         # Prepare month labels for chart
-        month_labels = []
-        for month in all_months:
-            try:
-                year, month_num = month.split('-')
-                month_name = calendar.month_name[int(month_num)]
-                month_labels.append(f"'{month_name} {year}'")
-            except:
-                month_labels.append("'Unknown'")
+        month_labels = json.dumps([display if display is not None else 'Unknown' for display in display_months])
         
         # Add chart and close HTML
         f.write(f"""
@@ -407,11 +568,11 @@ def generate_monthly_error_summary(project_name, daily_error_counts, output_dir)
         const summaryChart = new Chart(summaryCtx, {{
             type: 'bar',
             data: {{
-                labels: [{', '.join(month_labels)}],
+                labels: {month_labels},
                 datasets: [
                     {{
                         label: 'Error Count',
-                        data: [{', '.join([str(monthly_error_counts.get(month, 0)) for month in all_months])}],
+                        data: {json.dumps(error_counts)},
                         backgroundColor: 'rgba(255, 99, 132, 0.5)',
                         borderColor: 'rgba(255, 99, 132, 1)',
                         borderWidth: 1
@@ -448,81 +609,88 @@ def generate_monthly_error_summary(project_name, daily_error_counts, output_dir)
 </body>
 </html>""")
     
+    write_gzip_copy(monthly_report_file)
+    
     print(f"Generated monthly error summary: {monthly_report_file}")
     return monthly_report_file
 
-def main():
-    """Main function to process logs and generate reports."""
-    print("Fixed Daily Error Counter")
-    print("=" * 50)
+def process_project(project_data, workers=None):
+    """
+    Count one project's errors by day and write its error summaries.
     
-    projects_data = []
+    Args:
+        project_data: Row from the projects CSV
+        workers: Number of log scanner processes (see count_errors_by_day)
     
-    # Read projects from CSV
-    try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
-    except Exception as e:
-        print(f"Error reading projects CSV: {e}")
-        return
+    Returns:
+        str: The project name as listed in the CSV, or None if it was skipped
+    """
+    print("\n" + "=" * 50)
+    # load_projects() has already stripped the values (None for short rows)
+    project_name = (project_data.get('project') or '').replace('.', '_')
+    error_log_file = project_data.get('error_log_file') or ''
     
-    processed_projects = []
+    print(f"Processing project: {project_name}")
     
-    # Process each project
-    for project_data in projects_data:
-        print("\n" + "=" * 50)
-        project_name = project_data.get('project', '').strip().replace('.', '_')
-        error_log_file = project_data.get('error_log_file', '').strip()
-        
-        print(f"Processing project: {project_name}")
-        
-        if not project_name or not error_log_file:
-            print(f"Missing project name or error log file: {project_data}")
-            continue
-        
-        processed_projects.append(project_data['project'])
-        
-        # Create project directory
-        project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
-        ensure_dir(project_dir)
-        
-        # Count errors by day
-        daily_error_counts = count_errors_by_day(error_log_file)
-        
-        # Generate daily error report
-        daily_report = generate_daily_error_report(project_name, daily_error_counts, project_dir)
-        
-        # Generate monthly error summary
-        monthly_report = generate_monthly_error_summary(project_name, daily_error_counts, project_dir)
-        
-        # Update main index to include error reports
-        index_file = os.path.join(project_dir, "index.html")
-        if os.path.exists(index_file):
-            # Read existing index file
-            with open(index_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+    if not project_name or not error_log_file:
+        print(f"Missing project name or error log file: {project_data}")
+        return None
+    
+    # Create project directory
+    project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
+    ensure_dir(project_dir)
+    
+    # Count errors by day
+    daily_error_counts = count_errors_by_day(error_log_file, workers)
+    
+    # Generate daily error report
+    daily_report = generate_daily_error_report(project_name, daily_error_counts, project_dir)
+    
+    # Generate monthly error summary
+    monthly_report = generate_monthly_error_summary(project_name, daily_error_counts, project_dir)
+    
+    # Update main index to include error reports
+    index_file = os.path.join(project_dir, "index.html")
+    if os.path.exists(index_file):
+        with open(index_file, 'r+b') as f:
+            content = f.read()
+            body_end = content.find(b"</body>")
             
             # Check if error summary section already exists
-            if "<h2>Error Summary Reports</h2>" not in content:
-                # Add error summary section before closing </body> tag
+            if b"<h2>Error Summary Reports</h2>" not in content and body_end >= 0:
+                # Add error summary section before closing </body> tag,
+                # rewriting the file in place from that point only
                 error_section = f"""
     <h2>Error Summary Reports</h2>
     <ul>
         <li><a href="{os.path.basename(daily_report)}">Daily Error Counts</a></li>
         <li><a href="{os.path.basename(monthly_report)}">Monthly Error Summary</a></li>
     </ul>
-</body>"""
-                content = content.replace("</body>", error_section)
-                
-                # Write updated content
-                with open(index_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+</body>""".encode('utf-8')
+                f.seek(body_end)
+                f.write(content[body_end:].replace(b"</body>", error_section))
+                f.truncate()
                 print(f"Updated index file: {index_file}")
     
+    return project_data['project']
+
+def main():
+    """Main function to process logs and generate reports."""
+    print("Fixed Daily Error Counter")
+    print("=" * 50)
+    
+    
+    # Read projects from CSV
+    try:
+        projects_data = load_projects()
+    except Exception as e:
+        print(f"Error reading projects CSV: {e}")
+        return
+    
+    results = map_projects(process_project, projects_data, share_workers=True)
+    
+    processed_projects = [name for name in results if name]
+    
     print("\n" + "=" * 50)
     print("Error summary generation completed successfully.")
     print(f"Processed {len(processed_projects)} projects: {', '.join(processed_projects)}")
@@ -17,56 +17,100 @@ Requirements:
 
 import os
 import re
-import csv
-import glob
 import datetime
-import shutil
-from collections import defaultdict
+from collections import Counter
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT, ERROR_PATTERN
+    from config import OUTPUT_BASE_DIR, ERROR_PATTERN, scan_errors, date_str, load_projects, iter_file_blocks, print_sample_lines, publish_report, map_projects
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
 
+# Report file extensions listed on the daily index, in display order
+REPORT_EXTENSIONS = ('html', 'txt', 'csv', 'json', 'xml')
+
+# Report type prefix of a report file name (e.g. "error" in error_report_20250101.html)
+REPORT_TYPE_REGEX = re.compile(r'(\w+)_report_')
+
 def ensure_dir(directory):
-    """Create directory if it doesn't exist."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    """Create directory (and any missing parents) if it doesn't exist."""
+    os.makedirs(directory, exist_ok=True)
+
+def collect_errors(buf, error_counts, error_examples, end=None):
+    """
+    Count the PHP errors in a buffer of whole log lines.
+    
+    The buffer is scanned with config.scan_errors(), so the matching loop
+    runs inside the regex engine (or Hyperscan, when installed) rather than
+    once per line in Python. As with a per-line search, only the first match
+    on each line is used, and only the matched groups are decoded.
+    
+    Args:
+        buf: Bytes-like object holding whole log lines
+        error_counts: Counter of occurrences per error key, updated in place
+        error_examples: Dict of the first full error message per error key,
+            updated in place
+        end: Offset the scan stops at (defaults to the end of the buffer)
+    
+    Returns:
+        int: Number of lines with a PHP error
+    """
+    basename = os.path.basename
+    # Keys are collected and tallied with one Counter.update, which counts
+    # in C, instead of a Counter increment per line
+    error_keys = []
+    add_key = error_keys.append
+    for match in scan_errors(buf, end):
+        error_msg, file_path, line_num = [group.decode('utf-8', errors='replace').strip()
+                                          for group in match.groups()]
+        error_key = f"{error_msg} in {basename(file_path)} on line {line_num}"
+        # Only the first instance of each error is shown in the report
+        if error_key not in error_examples:
+            error_examples[error_key] = f"{error_msg} in {file_path} on line {line_num}"
+        add_key(error_key)
+    error_counts.update(error_keys)
+    return len(error_keys)
 
 def parse_error_log(error_log_file):
     """
     Parse error log file and extract error information.
     
+    The log is read in binary blocks cut at the last newline (the partial
+    line after it is carried over to the next block) and each block is
+    scanned with collect_errors().
+    
     Returns:
-        dict: Dictionary with error types as keys and lists of error instances as values
+        tuple: (Counter of occurrences per error key, dict of the first full
+        error message per error key)
     """
-    error_pattern = re.compile(ERROR_PATTERN)
-    errors = defaultdict(list)
+    error_counts = Counter()
+    error_examples = {}
     line_count = 0
     match_count = 0
     
     try:
         print(f"Opening error log file: '{error_log_file}'")
-        with open(error_log_file, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                line_count += 1
-                if line_count <= 5:  # Print first few lines for debugging
-                    print(f"Sample line {line_count}: {line[:100]}...")
-                
-                match = error_pattern.search(line)
-                if match:
-                    match_count += 1
-                    error_msg = match.group(1).strip()
-                    file_path = match.group(2).strip()
-                    line_num = match.group(3).strip()
-                    
-                    error_key = f"{error_msg} in {os.path.basename(file_path)} on line {line_num}"
-                    error_detail = f"{error_msg} in {file_path} on line {line_num}"
-                    errors[error_key].append(error_detail)
+        show_sample = True
+        tail = b''
+        for block in iter_file_blocks(error_log_file):
+            if show_sample:  # Print first few lines for debugging
+                print_sample_lines(block)
+                show_sample = False
+            buf = tail + block if tail else block
+            cut = buf.rfind(b'\n') + 1
+            tail = buf[cut:]
+            if not cut:
+                continue
+            match_count += collect_errors(buf, error_counts, error_examples, cut)
+            line_count += buf.count(b'\n', 0, cut)
+        
+        # Last line without a trailing newline
+        if tail:
+            match_count += collect_errors(tail, error_counts, error_examples)
+            line_count += 1
         
-        print(f"Processed {line_count} lines, found {match_count} PHP errors, unique errors: {len(errors)}")
+        print(f"Processed {line_count} lines, found {match_count} PHP errors, unique errors: {len(error_counts)}")
         
         # If no errors found but file exists, check regex pattern
         if match_count == 0 and line_count > 0:
@@ -95,19 +139,30 @@ def parse_error_log(error_log_file):
                         break
     except Exception as e:
         print(f"Error reading log file {error_log_file}: {e}")
-        return {}
+        return Counter(), {}
     
-    return errors
+    return error_counts, error_examples
 
-def generate_error_report(project_name, errors, output_dir):
-    """Generate an HTML report of errors."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+def generate_error_report(project_name, error_counts, error_examples, output_dir):
+    """
+    Generate an HTML report of errors.
+    
+    Args:
+        project_name: Project directory name
+        error_counts: Counter of occurrences per error key
+        error_examples: Dict of the first full error message per error key
+        output_dir: Directory to write the report to
+    
+    Returns:
+        str: Path to the generated report
+    """
+    today = date_str()
     report_file = os.path.join(output_dir, f"error_report_{today}.html")
     
     # Sort errors by frequency (highest first)
-    sorted_errors = sorted(errors.items(), key=lambda x: len(x[1]), reverse=True)
+    sorted_errors = error_counts.most_common()
     
-    html_content = f"""<!DOCTYPE html>
+    header = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Error Report for {project_name} - {today}</title>
@@ -129,27 +184,27 @@ def generate_error_report(project_name, errors, output_dir):
     <h1>Error Report for {project_name}</h1>
     <p>Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
     <h2>Summary</h2>
-    <p>Total unique errors: {len(errors)}</p>
-    <p>Total error occurrences: {sum(len(instances) for instances in errors.values())}</p>
+    <p>Total unique errors: {len(error_counts)}</p>
+    <p>Total error occurrences: {sum(error_counts.values())}</p>
     
     <h2>Error List</h2>
 """
     
-    for error_key, instances in sorted_errors:
-        html_content += f"""
+    with open(report_file, 'w', encoding='utf-8') as f:
+        write = f.write
+        write(header)
+        
+        write("".join(f"""
     <div class="error-item">
-        <p class="error-count">{len(instances)} - {error_key}</p>
-        <div class="error-example">Example: {instances[0]}</div>
+        <p class="error-count">{count} - {error_key}</p>
+        <div class="error-example">Example: {error_examples[error_key]}</div>
     </div>
-"""
-    
-    html_content += """
+""" for error_key, count in sorted_errors))
+        
+        write("""
 </body>
 </html>
-"""
-    
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+""")
     
     return report_file
 
@@ -157,7 +212,7 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     """Generate a summary HTML page for the project with links to daily reports."""
     summary_file = os.path.join(output_dir, "index.html")
     
-    html_content = f"""<!DOCTYPE html>
+    parts = [f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Project Summary for {project_name}</title>
@@ -181,7 +236,7 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     
     <h2>Daily Reports</h2>
     <ul>
-"""
+"""]
     
     # Sort reports by date (newest first)
     sorted_reports = sorted(daily_reports, reverse=True)
@@ -189,18 +244,18 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     for report in sorted_reports:
         report_date = report.split('_')[-1].split('.')[0]
         formatted_date = f"{report_date[:4]}-{report_date[4:6]}-{report_date[6:]}"
-        html_content += f"""
+        parts.append(f"""
         <li><a href="{report_date}/index.html">{formatted_date} Dashboard</a></li>
-"""
+""")
     
-    html_content += """
+    parts.append("""
     </ul>
 </body>
 </html>
-"""
+""")
     
     with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write("".join(parts))
     
     return summary_file
 
@@ -208,7 +263,7 @@ def generate_main_index(projects, output_base_dir):
     """Generate a main index HTML page with links to all project summaries."""
     index_file = os.path.join(output_base_dir, "index.html")
     
-    html_content = """<!DOCTYPE html>
+    parts = ["""<!DOCTYPE html>
 <html>
 <head>
     <title>GunLog Web Project Analysis</title>
@@ -230,25 +285,25 @@ def generate_main_index(projects, output_base_dir):
     
     <h2>Projects</h2>
     <div class="dashboard">
-"""
+"""]
     
     for project in sorted(projects):
         project_name = project.replace('.', '_')
-        html_content += f"""
+        parts.append(f"""
         <div class="card">
             <h3>{project}</h3>
             <a href="{project_name}/index.html">View Reports</a>
         </div>
-"""
+""")
     
-    html_content += """
+    parts.append("""
     </div>
 </body>
 </html>
-"""
+""")
     
     with open(index_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write("".join(parts))
     
     return index_file
 
@@ -267,26 +322,29 @@ def create_daily_index(project_dir, date_dir):
     date_str = os.path.basename(date_dir)
     formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
     
-    # Get all report files in the date directory
-    report_files = []
-    for ext in ['html', 'txt', 'csv', 'json', 'xml']:
-        report_files.extend(glob.glob(os.path.join(date_dir, f"*_report_*.{ext}")))
+    # Get all report files in the date directory, grouped by extension in
+    # REPORT_EXTENSIONS order; one directory read replaces a glob per extension
+    files_by_ext = {ext: [] for ext in REPORT_EXTENSIONS}
+    with os.scandir(date_dir) as entries:
+        for entry in entries:
+            # Same names as the glob "*_report_*.<ext>" (which skips dotfiles)
+            stem, dot, ext = entry.name.rpartition('.')
+            if dot and ext in files_by_ext and '_report_' in stem and not stem.startswith('.'):
+                files_by_ext[ext].append(entry.path)
+    report_files = [path for paths in files_by_ext.values() for path in paths]
     
     # Extract report types
     report_types = {}
     for report_file in report_files:
         basename = os.path.basename(report_file)
-        match = re.match(r'(\w+)_report_', basename)
+        match = REPORT_TYPE_REGEX.match(basename)
         if match:
-            report_type = match.group(1)
-            if report_type not in report_types:
-                report_types[report_type] = []
-            report_types[report_type].append(report_file)
+            report_types.setdefault(match.group(1), []).append(report_file)
     
     # Create index.html
     index_file = os.path.join(date_dir, "index.html")
     
-    html_content = f"""<!DOCTYPE html>
+    parts = [f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Analytics Dashboard for {project_name} - {formatted_date}</title>
@@ -315,7 +373,7 @@ def create_daily_index(project_dir, date_dir):
     <p>Date: {formatted_date}</p>
     
     <div class="dashboard">
-"""
+"""]
     
     # Report type descriptions
     descriptions = {
@@ -330,13 +388,13 @@ def create_daily_index(project_dir, date_dir):
     
     # Add cards for each report type
     for report_type, files in report_types.items():
-        html_content += f"""
+        parts.append(f"""
         <div class="card">
             <h3>{report_type.title()} Analytics</h3>
             <p class="description">{descriptions.get(report_type, "Analysis report")}</p>
             <div class="card-content">
                 <ul>
-"""
+""")
         
         for file in files:
             file_basename = os.path.basename(file)
@@ -356,102 +414,110 @@ def create_daily_index(project_dir, date_dir):
             else:
                 label = file_basename
             
-            html_content += f"""
+            parts.append(f"""
                     <li><a href="{file_basename}">{label}</a></li>
-"""
+""")
         
-        html_content += """
+        parts.append("""
                 </ul>
             </div>
         </div>
-"""
+""")
     
     # If there are no reports yet, show a message
     if not report_types:
-        html_content += """
+        parts.append("""
         <div class="card">
             <h3>No Reports Available</h3>
             <p>No analytics reports have been generated for this date yet.</p>
         </div>
-"""
+""")
     
-    html_content += """
+    parts.append("""
     </div>
 </body>
 </html>
-"""
+""")
     
     with open(index_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write("".join(parts))
     
     return index_file
 
+def process_project(project_data, today):
+    """
+    Parse one project's error log and write its error report, daily index
+    and project summary.
+    
+    Args:
+        project_data: Row from the projects CSV
+        today: Date string of the report directory (see date_str)
+    
+    Returns:
+        str: The project name as listed in the CSV (also when no errors were
+            found, so it still gets a card on the main index), or None if the
+            row was skipped
+    """
+    project_name = project_data.get('project', '').strip().replace('.', '_')
+    error_log_file = project_data.get('error_log_file', '').strip()
+    
+    if not project_name or not error_log_file:
+        print(f"Missing project name or error log file: {project_data}")
+        return None
+    
+    # Create project directory
+    project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
+    ensure_dir(project_dir)
+    
+    # Create date-specific directory
+    date_dir = os.path.join(project_dir, today)
+    ensure_dir(date_dir)
+    
+    # Parse error log
+    error_counts, error_examples = parse_error_log(error_log_file)
+    
+    if not error_counts:
+        print(f"No errors found or couldn't parse log for {project_name}")
+        return project_data['project']
+    
+    # Generate error report
+    report_file = generate_error_report(project_name, error_counts, error_examples, date_dir)
+    print(f"Generated error report for {project_name}: {report_file}")
+    
+    # Link the report into the project directory for the summary
+    report_basename = os.path.basename(report_file)
+    publish_report(report_file, os.path.join(project_dir, report_basename))
+    
+    # Create daily index page
+    index_file = create_daily_index(project_dir, date_dir)
+    print(f"Generated daily index for {project_name}: {index_file}")
+    
+    # Get all daily reports for this project
+    with os.scandir(project_dir) as entries:
+        daily_reports = [entry.name for entry in entries
+                         if entry.name.startswith('error_report_') and entry.name.endswith('.html')
+                         and entry.is_file()]
+    
+    # Generate project summary
+    summary_file = generate_project_summary(project_name, daily_reports, project_dir)
+    print(f"Generated project summary for {project_name}: {summary_file}")
+    
+    return project_data['project']
+
 def main():
     """Main function to process logs and generate reports."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
-    projects_data = []
+    today = date_str()
     
     # Read projects from CSV
     try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
+        projects_data = load_projects()
     except Exception as e:
         print(f"Error reading projects CSV: {e}")
         return
     
-    processed_projects = []
+    results = map_projects(process_project, projects_data, today)
     
-    # Process each project
-    for project_data in projects_data:
-        project_name = project_data.get('project', '').strip().replace('.', '_')
-        error_log_file = project_data.get('error_log_file', '').strip()
-        
-        if not project_name or not error_log_file:
-            print(f"Missing project name or error log file: {project_data}")
-            continue
-        
-        processed_projects.append(project_data['project'])
-        
-        # Create project directory
-        project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
-        ensure_dir(project_dir)
-        
-        # Create date-specific directory
-        date_dir = os.path.join(project_dir, today)
-        ensure_dir(date_dir)
-        
-        # Parse error log
-        errors = parse_error_log(error_log_file)
-        
-        if not errors:
-            print(f"No errors found or couldn't parse log for {project_name}")
-            continue
-        
-        # Generate error report
-        report_file = generate_error_report(project_name, errors, date_dir)
-        print(f"Generated error report for {project_name}: {report_file}")
-        
-        # Create a copy in the project directory for the summary
-        report_basename = os.path.basename(report_file)
-        shutil.copy(report_file, os.path.join(project_dir, report_basename))
-        
-        # Create daily index page
-        index_file = create_daily_index(project_dir, date_dir)
-        print(f"Generated daily index for {project_name}: {index_file}")
-        
-        # Get all daily reports for this project
-        daily_reports = []
-        for filename in os.listdir(project_dir):
-            if filename.startswith('error_report_') and filename.endswith('.html'):
-                daily_reports.append(filename)
-        
-        # Generate project summary
-        summary_file = generate_project_summary(project_name, daily_reports, project_dir)
-        print(f"Generated project summary for {project_name}: {summary_file}")
+    processed_projects = [name for name in results if name]
     
     # Generate main index
     if processed_projects:
@@ -21,12 +21,13 @@ import sys
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT, load_state, save_state
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     OUTPUT_BASE_DIR = "/usr/local/www/dart-studio.com/www/gunlog/"
     DATE_FORMAT = "%Y%m%d"
     PROJECTS_CSV = "/usr/local/www/dart-studio.com/www/gunlog/list_projects.csv"
+    load_state = save_state = None
     print(f"Using default settings: OUTPUT_BASE_DIR={OUTPUT_BASE_DIR}, DATE_FORMAT={DATE_FORMAT}")
 
 def create_main_index(output_base_dir):
@@ -435,8 +436,67 @@ def create_daily_index(project_dir, date_dir):
     print(f"Created daily index: {index_file}")
     return index_file
 
-def update_all_indexes():
-    """Update all project and date indexes."""
+def index_is_current(date_dir, indexed_mtime):
+    """
+    Check whether the index of a date directory is still up to date.
+    
+    Reports are rewritten in place, which does not change the mtime of the
+    directory, so every entry is compared with the index file instead.
+    
+    Args:
+        date_dir: Path to the date directory
+        indexed_mtime: st_mtime_ns of index.html when this script last wrote it
+    
+    Returns:
+        bool: True if index.html is the one written last time and no other
+        entry in the directory is newer
+    """
+    try:
+        index_mtime = os.stat(os.path.join(date_dir, "index.html")).st_mtime_ns
+    except OSError:
+        return False
+    
+    # Another script (e.g. gunlog_error) may have overwritten the index
+    if index_mtime != indexed_mtime:
+        return False
+    
+    with os.scandir(date_dir) as entries:
+        for entry in entries:
+            if entry.name != "index.html" and entry.stat().st_mtime_ns > index_mtime:
+                return False
+    return True
+
+def update_date_indexes(project_dir, indexed):
+    """
+    Create the daily index for every date directory of a project.
+    
+    Date directories whose index is still current (see index_is_current) are
+    skipped, so old days are not regenerated every run.
+    
+    Args:
+        project_dir: Path to the project directory
+        indexed: Dict mapping date directory paths to the st_mtime_ns of the
+            index.html written for them; updated in place
+    """
+    for date_item in os.listdir(project_dir):
+        date_dir = os.path.join(project_dir, date_item)
+        if os.path.isdir(date_dir) and date_item.isdigit():
+            if index_is_current(date_dir, indexed.get(date_dir)):
+                continue
+            
+            print(f"  Creating index for date: {date_item}")
+            
+            # Create date index
+            index_file = create_daily_index(project_dir, date_dir)
+            indexed[date_dir] = os.stat(index_file).st_mtime_ns
+
+def update_all_indexes(indexed):
+    """
+    Update all project and date indexes.
+    
+    Args:
+        indexed: Dict of already indexed date directories, see update_date_indexes
+    """
     print(f"Scanning directory: {OUTPUT_BASE_DIR}")
     
     # Create main index
@@ -451,20 +511,18 @@ def update_all_indexes():
             # Create project index
             create_project_index(project_dir)
             
-            # Find all date directories
-            for date_item in os.listdir(project_dir):
-                date_dir = os.path.join(project_dir, date_item)
-                if os.path.isdir(date_dir) and date_item.isdigit():
-                    print(f"  Creating index for date: {date_item}")
-                    
-                    # Create date index
-                    create_daily_index(project_dir, date_dir)
+            # Create the date indexes that are missing or out of date
+            update_date_indexes(project_dir, indexed)
 
 def main():
     """Main function."""
     print("Fixed Index Generator with Summary Links")
     print("-" * 40)
     
+    # Date directories indexed by earlier runs, kept in the runner state
+    state = load_state() if load_state is not None else {}
+    indexed = state.setdefault("indexed", {})
+    
     # Check for specific project to update
     if len(sys.argv) > 1:
         project_name = sys.argv[1]
@@ -479,17 +537,21 @@ def main():
         # Create project index
         create_project_index(project_dir)
         
-        # Find all date directories
-        for date_item in os.listdir(project_dir):
-            date_dir = os.path.join(project_dir, date_item)
-            if os.path.isdir(date_dir) and date_item.isdigit():
-                print(f"  Creating index for date: {date_item}")
-                
-                # Create date index
-                create_daily_index(project_dir, date_dir)
+        # Create the date indexes that are missing or out of date
+        update_date_indexes(project_dir, indexed)
     else:
         # Update all indexes
-        update_all_indexes()
+        update_all_indexes(indexed)
+    
+    # Forget date directories that have been removed since they were indexed
+    for date_dir in [d for d in indexed if not os.path.isdir(d)]:
+        del indexed[date_dir]
+    
+    if save_state is not None:
+        try:
+            save_state(state)
+        except OSError as e:
+            print(f"Warning: could not save index state: {e}")
     
     print("\nCompleted successfully!")
 
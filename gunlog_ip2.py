@@ -18,27 +18,26 @@ Requirements:
 
 import os
 import re
-import csv
 import datetime
-import shutil
 import socket
 import requests
+from operator import itemgetter
 from collections import Counter, defaultdict
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import OUTPUT_BASE_DIR, date_str, load_projects, iter_file_blocks, print_sample_lines, publish_report
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
 
 # IP address regular expression pattern
 IP_PATTERN = r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
+IP_REGEX_BYTES = re.compile(IP_PATTERN.encode())
 
 def ensure_dir(directory):
-    """Create directory if it doesn't exist."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    """Create directory (and any missing parents) if it doesn't exist."""
+    os.makedirs(directory, exist_ok=True)
 
 def get_ip_info(ip):
     """
@@ -85,27 +84,41 @@ def parse_access_log(access_log_file):
     """
     Parse access log file and extract IP addresses.
     
+    The log is read in binary blocks cut at the last newline (the partial
+    line after it is carried over to the next block). Each block is split
+    into lines and searched with map(), so the per-line loop runs in C and
+    only the matched addresses are decoded.
+    
     Returns:
         Counter: Counter object with IP addresses and their counts
     """
-    ip_pattern = re.compile(IP_PATTERN)
-    ip_counts = Counter()
+    search = IP_REGEX_BYTES.search
+    first_group = itemgetter(1)
+    raw_counts = Counter()
     line_count = 0
-    match_count = 0
     
     try:
         print(f"Opening access log file: '{access_log_file}'")
-        with open(access_log_file, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                line_count += 1
-                if line_count <= 3:  # Print first few lines for debugging
-                    print(f"Sample line {line_count}: {line[:100]}...")
-                
-                match = ip_pattern.search(line)
-                if match:
-                    match_count += 1
-                    ip = match.group(1)
-                    ip_counts[ip] += 1
+        show_sample = True
+        tail = b''
+        for block in iter_file_blocks(access_log_file):
+            if show_sample:  # Print first few lines for debugging
+                print_sample_lines(block, 3)
+                show_sample = False
+            lines = (tail + block if tail else block).split(b'\n')
+            tail = lines.pop()
+            line_count += len(lines)
+            # Counter.update tallies the addresses in C
+            raw_counts.update(map(first_group, filter(None, map(search, lines))))
+        
+        # Last line without a trailing newline
+        if tail:
+            line_count += 1
+            raw_counts.update(map(first_group, filter(None, [search(tail)])))
+        
+        match_count = sum(raw_counts.values())
+        # Addresses are only ASCII digits and dots
+        ip_counts = Counter({ip.decode('ascii'): count for ip, count in raw_counts.items()})
         
         print(f"Processed {line_count} lines, found {match_count} IP addresses, unique IPs: {len(ip_counts)}")
     except Exception as e:
@@ -116,13 +129,13 @@ def parse_access_log(access_log_file):
 
 def generate_ip_report(project_name, ip_counts, output_dir):
     """Generate an HTML report of IP access counts with owner information."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"ip_report_{today}.html")
     
     # Sort IPs by frequency (highest first)
     sorted_ips = ip_counts.most_common()
     
-    html_content = f"""<!DOCTYPE html>
+    header = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>IP Access Report for {project_name} - {today}</title>
@@ -157,13 +170,17 @@ def generate_ip_report(project_name, ip_counts, output_dir):
         </tr>
 """
     
-    # Add top 100 IPs to the table with owner information
-    for ip, count in sorted_ips[:100]:
-        # Get IP info (only for top 100 IPs to avoid rate limiting)
-        ip_info = get_ip_info(ip)
-        location = f"{ip_info.get('city', '')} {ip_info.get('country', '')}".strip()
+    with open(report_file, 'w', encoding='utf-8') as f:
+        write = f.write
+        write(header)
         
-        html_content += f"""
+        # Add top 100 IPs to the table with owner information
+        for ip, count in sorted_ips[:100]:
+            # Get IP info (only for top 100 IPs to avoid rate limiting)
+            ip_info = get_ip_info(ip)
+            location = f"{ip_info.get('city', '')} {ip_info.get('country', '')}".strip()
+            
+            write(f"""
         <tr>
             <td>{count}</td>
             <td>{ip}</td>
@@ -172,16 +189,13 @@ def generate_ip_report(project_name, ip_counts, output_dir):
             <td>{location}</td>
             <td>{ip_info.get('hostname', '')}</td>
         </tr>
-"""
-    
-    html_content += """
+""")
+        
+        write("""
     </table>
 </body>
 </html>
-"""
-    
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+""")
     
     return report_file
 
@@ -189,7 +203,7 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     """Generate a summary HTML page for the project with links to daily IP reports."""
     summary_file = os.path.join(output_dir, "ip_index.html")
     
-    html_content = f"""<!DOCTYPE html>
+    parts = [f"""<!DOCTYPE html>
 <html>
 <head>
     <title>IP Access Summary for {project_name}</title>
@@ -208,7 +222,7 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     
     <h2>Daily Reports</h2>
     <ul>
-"""
+"""]
     
     # Sort reports by date (newest first)
     sorted_reports = sorted(daily_reports, reverse=True)
@@ -216,18 +230,18 @@ def generate_project_summary(project_name, daily_reports, output_dir):
     for report in sorted_reports:
         report_date = report.split('_')[-1].split('.')[0]
         formatted_date = f"{report_date[:4]}-{report_date[4:6]}-{report_date[6:]}"
-        html_content += f"""
+        parts.append(f"""
         <li><a href="{report_date}/{os.path.basename(report)}">{formatted_date}</a></li>
-"""
+""")
     
-    html_content += """
+    parts.append("""
     </ul>
 </body>
 </html>
-"""
+""")
     
     with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write("".join(parts))
     
     return summary_file
 
@@ -295,74 +309,82 @@ def generate_single_ip_lookup(ip, output_dir):
     
     return report_file
 
+def process_project(project_data, today):
+    """
+    Parse one project's access log and write its IP report, the lookups
+    for its top addresses and its summary.
+    
+    Args:
+        project_data: Row from the projects CSV
+        today: Date string of the report directory (see date_str)
+    
+    Returns:
+        str: The project name as listed in the CSV, or None if the row was
+            skipped
+    """
+    project_name = project_data.get('project', '').strip().replace('.', '_')
+    access_log_file = project_data.get('log_file', '').strip()
+    
+    if not project_name or not access_log_file:
+        print(f"Missing project name or access log file: {project_data}")
+        return None
+    
+    # Create project directory
+    project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
+    ensure_dir(project_dir)
+    
+    # Create date-specific directory
+    date_dir = os.path.join(project_dir, today)
+    ensure_dir(date_dir)
+    
+    # Parse access log
+    ip_counts = parse_access_log(access_log_file)
+    
+    if not ip_counts:
+        print(f"No IP addresses found or couldn't parse log for {project_name}")
+        return project_data['project']
+    
+    # Generate HTML report
+    html_report_file = generate_ip_report(project_name, ip_counts, date_dir)
+    print(f"Generated HTML IP report for {project_name}: {html_report_file}")
+    
+    # Link the report into the project directory for the summary
+    html_report_basename = os.path.basename(html_report_file)
+    publish_report(html_report_file, os.path.join(project_dir, html_report_basename))
+    
+    # Generate detailed lookups for top 10 IPs
+    print("Generating detailed lookups for top IPs...")
+    for ip, count in ip_counts.most_common(10):
+        lookup_file = generate_single_ip_lookup(ip, date_dir)
+        print(f"Generated lookup for {ip}: {lookup_file}")
+    
+    # Get all daily HTML reports for this project
+    with os.scandir(project_dir) as entries:
+        daily_reports = [entry.name for entry in entries
+                         if entry.name.startswith('ip_report_') and entry.name.endswith('.html')
+                         and entry.is_file()]
+    
+    # Generate project summary
+    summary_file = generate_project_summary(project_name, daily_reports, project_dir)
+    print(f"Generated IP access summary for {project_name}: {summary_file}")
+    
+    return project_data['project']
+
 def main():
     """Main function to process logs and generate reports."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
-    projects_data = []
+    today = date_str()
     
     # Read projects from CSV
     try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
+        projects_data = load_projects()
     except Exception as e:
         print(f"Error reading projects CSV: {e}")
         return
     
-    processed_projects = []
-    
-    # Process each project
+    # Projects are processed in turn: get_ip_info() queries a rate-limited
+    # web service, which parallel projects would only hit harder
     for project_data in projects_data:
-        project_name = project_data.get('project', '').strip().replace('.', '_')
-        access_log_file = project_data.get('log_file', '').strip()
-        
-        if not project_name or not access_log_file:
-            print(f"Missing project name or access log file: {project_data}")
-            continue
-        
-        processed_projects.append(project_data['project'])
-        
-        # Create project directory
-        project_dir = os.path.join(OUTPUT_BASE_DIR, project_name)
-        ensure_dir(project_dir)
-        
-        # Create date-specific directory
-        date_dir = os.path.join(project_dir, today)
-        ensure_dir(date_dir)
-        
-        # Parse access log
-        ip_counts = parse_access_log(access_log_file)
-        
-        if not ip_counts:
-            print(f"No IP addresses found or couldn't parse log for {project_name}")
-            continue
-        
-        # Generate HTML report
-        html_report_file = generate_ip_report(project_name, ip_counts, date_dir)
-        print(f"Generated HTML IP report for {project_name}: {html_report_file}")
-        
-        # Create copies in the project directory for the summary
-        html_report_basename = os.path.basename(html_report_file)
-        shutil.copy(html_report_file, os.path.join(project_dir, html_report_basename))
-        
-        # Generate detailed lookups for top 10 IPs
-        print("Generating detailed lookups for top IPs...")
-        for ip, count in ip_counts.most_common(10):
-            lookup_file = generate_single_ip_lookup(ip, date_dir)
-            print(f"Generated lookup for {ip}: {lookup_file}")
-        
-        # Get all daily HTML reports for this project
-        daily_reports = []
-        for filename in os.listdir(project_dir):
-            if filename.startswith('ip_report_') and filename.endswith('.html'):
-                daily_reports.append(filename)
-        
-        # Generate project summary
-        summary_file = generate_project_summary(project_name, daily_reports, project_dir)
-        print(f"Generated IP access summary for {project_name}: {summary_file}")
+        process_project(project_data, today)
     
     print("IP access log analysis completed successfully.")
 
@@ -16,7 +16,6 @@ Requirements:
 
 import os
 import re
-import csv
 import datetime
 import shutil
 import statistics
@@ -24,7 +23,7 @@ from collections import Counter, defaultdict
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import OUTPUT_BASE_DIR, date_str, load_projects
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
@@ -252,7 +251,7 @@ def calculate_summary_metrics(metrics):
 
 def generate_performance_report(project_name, metrics, summary, output_dir):
     """Generate an HTML report of performance metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"performance_report_{today}.html")
     
     html_content = f"""<!DOCTYPE html>
@@ -816,7 +815,7 @@ def generate_performance_report(project_name, metrics, summary, output_dir):
 
 def generate_plain_text_report(project_name, metrics, summary, output_dir):
     """Generate a plain text report of performance metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"performance_report_{today}.txt")
     
     with open(report_file, 'w', encoding='utf-8') as f:
@@ -878,17 +877,11 @@ def generate_plain_text_report(project_name, metrics, summary, output_dir):
 
 def main():
     """Main function to process logs and generate reports."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
-    projects_data = []
+    today = date_str()
     
     # Read projects from CSV
     try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
+        projects_data = load_projects()
     except Exception as e:
         print(f"Error reading projects CSV: {e}")
         return
@@ -16,7 +16,6 @@ Requirements:
 
 import os
 import re
-import csv
 import datetime
 import shutil
 import urllib.parse
@@ -25,7 +24,7 @@ from urllib.parse import urlparse, parse_qs
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import OUTPUT_BASE_DIR, date_str, load_projects
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
@@ -414,7 +413,7 @@ def parse_access_log(access_log_file):
 
 def generate_seo_report(project_name, metrics, output_dir):
     """Generate an HTML report of SEO metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"seo_report_{today}.html")
     
     # Calculate overall SEO score
@@ -1303,7 +1302,7 @@ def generate_seo_report(project_name, metrics, output_dir):
 
 def generate_plain_text_report(project_name, metrics, output_dir):
     """Generate a plain text report of SEO metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"seo_report_{today}.txt")
     
     # Calculate SEO score
@@ -1399,17 +1398,11 @@ def generate_plain_text_report(project_name, metrics, output_dir):
 
 def main():
     """Main function to process logs and generate reports."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
-    projects_data = []
+    today = date_str()
     
     # Read projects from CSV
     try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
+        projects_data = load_projects()
     except Exception as e:
         print(f"Error reading projects CSV: {e}")
         return
@@ -17,7 +17,6 @@ Requirements:
 
 import os
 import re
-import csv
 import datetime
 import shutil
 import urllib.parse
@@ -44,7 +43,7 @@ except ImportError:
 
 # Import configuration
 try:
-    from config import PROJECTS_CSV, OUTPUT_BASE_DIR, DATE_FORMAT
+    from config import OUTPUT_BASE_DIR, date_str, load_projects
 except ImportError:
     print("Error: config.py file not found! Please create it with the required settings.")
     exit(1)
@@ -583,7 +582,7 @@ def calculate_visitor_flow(metrics, max_steps=5):
 
 def generate_traffic_report(project_name, metrics, output_dir):
     """Generate an HTML report of traffic metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"traffic_report_{today}.html")
     
     # Calculate some derived metrics
@@ -1505,7 +1504,7 @@ def generate_traffic_report(project_name, metrics, output_dir):
 
 def generate_plain_text_report(project_name, metrics, output_dir):
     """Generate a plain text report of traffic metrics."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
+    today = date_str()
     report_file = os.path.join(output_dir, f"traffic_report_{today}.txt")
     
     # Calculate some derived metrics
@@ -1593,17 +1592,11 @@ def generate_plain_text_report(project_name, metrics, output_dir):
 
 def main():
     """Main function to process logs and generate reports."""
-    today = datetime.datetime.now().strftime(DATE_FORMAT)
-    projects_data = []
+    today = date_str()
     
     # Read projects from CSV
     try:
-        with open(PROJECTS_CSV, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, skipinitialspace=True)
-            for row in reader:
-                # Clean any whitespace from all values in the row
-                cleaned_row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                projects_data.append(cleaned_row)
+        projects_data = load_projects()
     except Exception as e:
         print(f"Error reading projects CSV: {e}")
         return